@@ -1,27 +1,35 @@
 import os
+from multiprocessing import Pool
 from generate_input import LargeScaleInputGenerator
 
-def batch_produce(count=50, output_dir="batch_output"):
+def _gen_one(i, output_dir):
+    current_seed = 1000 + i
+    
+    generator = LargeScaleInputGenerator(seed=current_seed)
+    
+    input_data = generator.generate_complete_input(
+        num_courses=50,
+        num_instructors=30,
+        num_rooms=20,
+        num_students=1000,
+        num_weeks=14
+    )
+    
+    filename = os.path.join(output_dir, f"schedule_input_{i:03d}.json")
+    
+    generator.save_to_file(input_data, filename)
+    return filename
+
+def batch_produce(count=50, output_dir="batch_output", processes=None):
     os.makedirs(output_dir, exist_ok=True)
     
     print(f"Start generating {count} dataset...")
 
-    for i in range(1, count + 1):
-        current_seed = 1000 + i
-        
-        generator = LargeScaleInputGenerator(seed=current_seed)
-        
-        input_data = generator.generate_complete_input(
-            num_courses=50,
-            num_instructors=30,
-            num_rooms=20,
-            num_students=1000,
-            num_weeks=14
-        )
-        
-        filename = os.path.join(output_dir, f"schedule_input_{i:03d}.json")
-        
-        generator.save_to_file(input_data, filename)
+    # Each dataset has its own seed, so they can be generated independently
+    with Pool(processes or os.cpu_count()) as pool:
+        filenames = pool.starmap(_gen_one, [(i, output_dir) for i in range(1, count + 1)])
+    
+    for i, filename in enumerate(filenames, start=1):
         print(f"[{i}/{count}] 已保存: {filename}")
 
 if __name__ == "__main__":
@@ -1,17 +1,26 @@
 import os
+import io
+import codecs
 import glob
 import subprocess
 import re
 import json
-import matplotlib.pyplot as plt
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import pandas as pd
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib json encoder
+    orjson = None
+
 # Set UTF-8 encoding for Windows compatibility
 if os.name == 'nt':  # Windows
     import sys
     if sys.stdout.encoding != 'utf-8':
-        import io
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
 
 # ================= CONFIGURATION =================
@@ -32,14 +41,35 @@ INPUT_DIR = os.path.join(CURRENT_DIR, "batch_output")
 TRACKING_DIR = os.path.join(PROJECT_ROOT, "Results", "tracking_logs")
 PLOTS_DIR = os.path.join(PROJECT_ROOT, "Results", "plots")
 
+# Number of Julia solvers run at the same time. Defaults to 1 (sequential):
+# each solve already uses 8 Gurobi threads, concurrent solves would skew the
+# time-to-quality curves, and a single-use license allows only one at a time.
+# Opt in with MAX_PARALLEL_SOLVERS=N when cores and license allow.
+MAX_PARALLEL_SOLVERS = max(1, int(os.environ.get("MAX_PARALLEL_SOLVERS", "1")))
+
+# Re-run inputs that already have a tracking log (set FORCE_RERUN=1)
+FORCE_RERUN = os.environ.get("FORCE_RERUN", "0") == "1"
+
 # ================= REGEX PATTERNS =================
 # Regex to capture Initial Score from Julia output
 # Matches: "📊 Initial Heuristic Score: 1234.5 (S1: ... S2: ... S3: ...)"
-REGEX_INITIAL_SCORE = re.compile(r"Initial Heuristic Score:\s*([\d\.]+)")
+REGEX_INITIAL_SCORE = re.compile(r"Initial Heuristic Score:\s*(?P<init>[\d\.]+)")
 
 # Regex to capture Gurobi Progress
-# Matches lines ending in 's' (seconds) with objective values
-REGEX_GUROBI_LOG = re.compile(r"^\s*(H|\*)?\s*\d+\s+\d+.*?\s+([0-9\.]+)\s+[0-9\.]+\s+.*?\s+(\d+)s")
+# Matches node log rows "... Incumbent BestBd Gap It/Node Time", e.g.
+# "H  120    45                    4317.00000 3900.00000  9.66%  12.3  120s"
+# Whitespace is [ \t] only so a match never spans lines of a multi-line buffer
+REGEX_GUROBI_LOG = re.compile(
+    r"^[ \t]*(?P<marker>H|\*)?[ \t]*\d+[ \t]+\d+.*?[ \t](?P<incumbent>\d+(?:\.\d*)?(?:e[+-]?\d+)?)"
+    r"[ \t]+\S+[ \t]+(?:[\d\.]+%|-)[ \t]+\S+[ \t]+(?P<time>\d+)s[ \t]*$",
+    re.M
+)
+
+# Both patterns as one alternation so the output is scanned once
+REGEX_SOLVER_OUTPUT = re.compile(f"{REGEX_INITIAL_SCORE.pattern}|{REGEX_GUROBI_LOG.pattern}", re.M)
+
+# Maximum bytes taken from the solver stdout pipe per read
+READ_CHUNK_SIZE = 65536
 
 def ensure_dirs():
     os.makedirs(TRACKING_DIR, exist_ok=True)
@@ -47,108 +77,105 @@ def ensure_dirs():
 
 def parse_solver_output(process, filename):
     """
-    Reads stdout line by line to capture optimization progress.
+    Reads whatever stdout has available (up to READ_CHUNK_SIZE bytes) and
+    scans each block of complete lines with finditer to capture
+    optimization progress as it streams in.
     """
     tracking_data = []
     initial_score = None
+    seen_times = set()  # Only the first row logged at each second is kept
     
     print(f"   ... Running solver for {filename}")
     
-    # Debug: print first few lines to see what we're getting
+    # Debug: keep first few lines to see what we're getting
     debug_lines = []
-    line_count = 0
+    buf = ''
     
-    for line in iter(process.stdout.readline, ''):
-        if not line:
-            break
-        line_count += 1
-        if line_count <= 5:  # Print first 5 lines for debugging
-            debug_lines.append(line.strip())
+    # os.read returns as soon as any output is available, unlike a buffered
+    # read(n) which waits for n characters or EOF; decode incrementally so
+    # multi-byte characters split across reads survive, and translate
+    # newlines as text mode would
+    fd = process.stdout.fileno()
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder('utf-8')(errors='replace'), translate=True
+    )
+    
+    while True:
+        raw = os.read(fd, READ_CHUNK_SIZE)
+        chunk = decoder.decode(raw, final=not raw)
+        if raw:
+            buf += chunk
+            last_nl = buf.rfind('\n')
+            if last_nl < 0:
+                continue
+            block, buf = buf[:last_nl], buf[last_nl + 1:]
+        else:
+            # EOF: parse whatever is left after the final newline
+            block, buf = buf + chunk, ''
         
-        line = line.strip()
-        if not line:
-            continue
-            
-        # 1. Capture Initial Score (Baseline)
-        # Try both with and without emoji prefix
-        init_match = REGEX_INITIAL_SCORE.search(line)
-        if init_match:
-            initial_score = float(init_match.group(1))
-            print(f"      -> Detected Initial Score: {initial_score}")
-            tracking_data.append({
-                "time": 0,
-                "objective": initial_score,
-                "pct_reduced": 0.0
-            })
-            continue
+        if len(debug_lines) < 5:  # First 5 lines for debugging
+            debug_lines.extend(l.strip() for l in block.splitlines()[:5 - len(debug_lines)])
         
-        # Also check for the emoji version (📊)
-        if "Initial Heuristic Score:" in line or "📊 Initial Heuristic Score:" in line:
-            # Extract the number after the colon
-            match = re.search(r"Initial Heuristic Score:\s*([\d\.]+)", line)
-            if match:
-                initial_score = float(match.group(1))
-                print(f"      -> Detected Initial Score: {initial_score}")
+        # Once the baseline is known only Gurobi rows need to be matched
+        pattern = REGEX_SOLVER_OUTPUT if initial_score is None else REGEX_GUROBI_LOG
+        for match in pattern.finditer(block):
+            # 1. Capture Initial Score (Baseline)
+            if initial_score is None:
+                if match.group('init') is None:
+                    continue
+                initial_score = float(match.group('init'))
+                print(f"      [{filename}] -> Detected Initial Score: {initial_score}")
                 tracking_data.append({
                     "time": 0,
                     "objective": initial_score,
                     "pct_reduced": 0.0
                 })
+                seen_times.add(0)
                 continue
 
-        # 2. Capture Gurobi Improvements
-        if "Incumbent" in line and "Time" in line:
-            continue 
+            # 2. Capture Gurobi Improvements (Incumbent column of the node log)
+            if not initial_score:
+                continue
             
-        parts = line.split()
-        # Basic heuristic to identify Gurobi log lines ending in 's'
-        if len(parts) > 5 and parts[-1].endswith('s') and initial_score:
-            try:
-                time_str = parts[-1].replace('s', '')
-                time_val = int(time_str)
-                
-                current_best = None
-                
-                # Heuristic: Find first float <= Initial Score that looks like an objective
-                floats = []
-                for p in parts:
-                    try:
-                        f = float(p)
-                        floats.append(f)
-                    except:
-                        pass
-                
-                for f in floats:
-                    if f <= initial_score and f > 0:
-                        # Filter out small integers that might be node counts
-                        if f > 100000 or f < initial_score - 1: 
-                            current_best = f
-                            break
-                
-                # Fallback for 'H' (Heuristic) lines
-                if current_best is None and "H" in parts[0]:
-                    current_best = float(parts[-2])
-                
-                if current_best is not None:
-                    pct_reduced = ((initial_score - current_best) / initial_score) * 100
-                    
-                    if not tracking_data or tracking_data[-1]['time'] != time_val:
-                        tracking_data.append({
-                            "time": time_val,
-                            "objective": current_best,
-                            "pct_reduced": pct_reduced
-                        })
-            except Exception:
-                pass 
+            time_val = int(match.group('time'))
+            if time_val in seen_times:
+                continue
+            seen_times.add(time_val)
+            
+            current_best = float(match.group('incumbent'))
+            pct_reduced = ((initial_score - current_best) / initial_score) * 100
+            tracking_data.append({
+                "time": time_val,
+                "objective": current_best,
+                "pct_reduced": pct_reduced
+            })
+        
+        if not raw:
+            break
 
     # Debug output if no data found
     if not tracking_data and debug_lines:
-        print(f"      ⚠️ Debug: First 5 output lines:")
+        print(f"      [{filename}] ⚠️ Debug: First 5 output lines:")
         for dl in debug_lines:
-            print(f"         {dl}")
+            print(f"      [{filename}]    {dl}")
     
     return tracking_data, initial_score
 
+# Each worker thread reuses one Agg figure across its plot_progress calls.
+# Figure/FigureCanvasAgg bypass pyplot's global state, so threads need no lock.
+_progress_figures = threading.local()
+
+def _get_progress_axes():
+    fig = getattr(_progress_figures, 'fig', None)
+    if fig is None:
+        fig = Figure(figsize=(10, 6), dpi=100)
+        FigureCanvasAgg(fig)
+        _progress_figures.fig = fig
+        _progress_figures.ax = fig.add_subplot(1, 1, 1)
+    else:
+        _progress_figures.ax.clear()
+    return fig, _progress_figures.ax
+
 def plot_progress(data, file_basename, initial_score):
     if not data:
         print(f"      ⚠️ No tracking data found for {file_basename}")
@@ -156,27 +183,133 @@ def plot_progress(data, file_basename, initial_score):
 
     df = pd.DataFrame(data)
     
-    plt.figure(figsize=(10, 6))
-    plt.plot(df['time'], df['pct_reduced'], marker='o', linestyle='-', color='#2c3e50', linewidth=2)
+    fig, ax = _get_progress_axes()
+    ax.plot(df['time'], df['pct_reduced'], marker='o', linestyle='-', color='#2c3e50', linewidth=2)
     
-    plt.title(f"Optimization Progress: {file_basename}\nInitial Penalty: {int(initial_score)}", fontsize=14)
-    plt.xlabel("Time (seconds)", fontsize=12)
-    plt.ylabel("Reduction in Penalty (%)", fontsize=12)
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.ylim(bottom=0) 
+    ax.set_title(f"Optimization Progress: {file_basename}\nInitial Penalty: {int(initial_score)}", fontsize=14)
+    ax.set_xlabel("Time (seconds)", fontsize=12)
+    ax.set_ylabel("Reduction in Penalty (%)", fontsize=12)
+    ax.grid(True, linestyle='--', alpha=0.7)
+    ax.set_ylim(bottom=0) 
     
-    plt.fill_between(df['time'], df['pct_reduced'], color='#3498db', alpha=0.2)
+    ax.fill_between(df['time'], df['pct_reduced'], color='#3498db', alpha=0.2)
     
     if not df.empty:
         final = df.iloc[-1]
-        plt.annotate(f"{final['pct_reduced']:.1f}%", 
-                     (final['time'], final['pct_reduced']),
-                     xytext=(5, 5), textcoords='offset points')
+        ax.annotate(f"{final['pct_reduced']:.1f}%", 
+                    (final['time'], final['pct_reduced']),
+                    xytext=(5, 5), textcoords='offset points')
 
     plot_path = os.path.join(PLOTS_DIR, f"{file_basename}.png")
-    plt.savefig(plot_path)
-    plt.close()
-    print(f"      📸 Plot saved to {plot_path}")
+    fig.canvas.print_png(plot_path)
+    print(f"      [{file_basename}] 📸 Plot saved to {plot_path}")
+
+def parse_gurobi_logfile(gurobi_log_path, initial_score):
+    """
+    Parses the node log table of a finished Gurobi LogFile with pandas.
+    Returns checkpoints in the same format as parse_solver_output, or []
+    if the file has no usable table.
+    """
+    if not initial_score or not os.path.exists(gurobi_log_path):
+        return []
+    
+    with open(gurobi_log_path, 'r', encoding='utf-8', errors='replace') as f:
+        lines = f.read().splitlines()
+    
+    header_idx = next((k for k, line in enumerate(lines)
+                       if "Incumbent" in line and "BestBd" in line), None)
+    if header_idx is None:
+        return []
+    
+    # Rows have blank Obj/Depth/IntInf cells on heuristic (H/*) lines, so split
+    # the fixed right-hand columns: Incumbent BestBd Gap It/Node Time
+    rows = pd.Series(lines[header_idx + 1:], dtype=object).str.strip()
+    rows = rows[rows.str.endswith('s')]
+    if rows.empty:
+        return []
+    cols = rows.str.rsplit(n=5, expand=True)
+    if cols.shape[1] < 6:
+        return []
+    
+    table = pd.DataFrame({
+        'time': pd.to_numeric(cols[5].str[:-1], errors='coerce'),
+        'objective': pd.to_numeric(cols[1], errors='coerce'),
+        'gap': cols[3],
+    })
+    is_row = table['gap'].str.endswith('%') | (table['gap'] == '-')
+    table = table[is_row].dropna(subset=['time', 'objective'])
+    table = table[table['time'] > 0].drop_duplicates('time')
+    table['time'] = table['time'].astype(int)
+    table['pct_reduced'] = (initial_score - table['objective']) / initial_score * 100
+    
+    checkpoints = table[['time', 'objective', 'pct_reduced']].to_dict('records')
+    return [{"time": 0, "objective": initial_score, "pct_reduced": 0.0}] + checkpoints
+
+def write_tracking_log(log_path, file_basename, initial_score, tracking_data):
+    """
+    Writes a JSON Lines tracking log: one header row with the filename and
+    initial score, followed by one row per checkpoint.
+    """
+    rows = [{"filename": file_basename, "initial_score": initial_score}] + tracking_data
+    if orjson is not None:
+        with open(log_path, 'wb') as f:
+            f.write(b"\n".join(orjson.dumps(row) for row in rows) + b"\n")
+    else:
+        with open(log_path, 'w') as f:
+            f.write("".join(json.dumps(row) + "\n" for row in rows))
+
+def has_tracking_log(input_path, prefix):
+    """
+    True if a tracking log (JSON Lines or legacy JSON) already exists for the
+    input. prefix is TRACKING_DIR + os.sep, computed once by the caller.
+    """
+    file_basename = os.path.splitext(os.path.basename(input_path))[0]
+    return (os.path.exists(f"{prefix}{file_basename}_log.jsonl")
+            or os.path.exists(f"{prefix}{file_basename}_log.json"))
+
+def _run_one(i, total, input_path, env):
+    file_basename = os.path.splitext(os.path.basename(input_path))[0]
+    print(f"[{i+1}/{total}] Processing: {file_basename}")
+    
+    # Run from Julia_Solver directory so includes work correctly
+    julia_solver_dir = os.path.join(PROJECT_ROOT, "Julia_Solver")
+    solver_script_name = os.path.basename(SOLVER_SCRIPT)
+    # Gurobi appends to an existing LogFile, so start from a clean one
+    gurobi_log_path = os.path.join(TRACKING_DIR, f"{file_basename}_gurobi.log")
+    if os.path.exists(gurobi_log_path):
+        os.remove(gurobi_log_path)
+    cmd = [JULIA_EXECUTABLE, solver_script_name, input_path, "--logfile", gurobi_log_path]
+    
+    # Run Julia and capture output from the correct directory
+    try:
+        proc = subprocess.Popen(
+            cmd, 
+            stdout=subprocess.PIPE, 
+            stderr=subprocess.STDOUT,  # Bytes; parse_solver_output decodes as UTF-8
+            cwd=julia_solver_dir,  # Run from Julia_Solver directory
+            env=env  # Pass environment variables with Gurobi license
+        )
+        tracking_data, initial_score = parse_solver_output(proc, file_basename)
+        proc.wait()  # Wait for process to complete
+        
+        # Prefer the complete Gurobi LogFile; stdout rows are the fallback
+        logfile_data = parse_gurobi_logfile(gurobi_log_path, initial_score)
+        if logfile_data:
+            tracking_data = logfile_data
+    except Exception as e:
+        print(f"      ❌ Error running solver for {file_basename}: {e}")
+        tracking_data = []
+        initial_score = None
+        
+    if tracking_data:
+        log_path = os.path.join(TRACKING_DIR, f"{file_basename}_log.jsonl")
+        write_tracking_log(log_path, file_basename, initial_score, tracking_data)
+        
+        plot_progress(tracking_data, file_basename, initial_score if initial_score else 0)
+    else:
+        print(f"      ⚠️ Failed to extract tracking data for {file_basename}. Check if Julia/Gurobi ran correctly.")
+    
+    print("-" * 60)
 
 def run_batch():
     ensure_dirs()
@@ -221,49 +354,19 @@ def run_batch():
         except:
             pass
 
-    for i, input_path in enumerate(input_files):
-        file_basename = os.path.splitext(os.path.basename(input_path))[0]
-        print(f"[{i+1}/{len(input_files)}] Processing: {file_basename}")
-        
-        # Run from Julia_Solver directory so includes work correctly
-        julia_solver_dir = os.path.join(PROJECT_ROOT, "Julia_Solver")
-        solver_script_name = os.path.basename(SOLVER_SCRIPT)
-        cmd = [JULIA_EXECUTABLE, solver_script_name, input_path]
-        
-        # Run Julia and capture output from the correct directory
-        try:
-            proc = subprocess.Popen(
-                cmd, 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.STDOUT, 
-                text=True, 
-                encoding='utf-8',
-                errors='replace',  # Replace invalid UTF-8 sequences instead of failing
-                bufsize=1,
-                cwd=julia_solver_dir,  # Run from Julia_Solver directory
-                env=env  # Pass environment variables with Gurobi license
-            )
-            tracking_data, initial_score = parse_solver_output(proc, file_basename)
-            proc.wait()  # Wait for process to complete
-        except Exception as e:
-            print(f"      ❌ Error running solver: {e}")
-            tracking_data = []
-            initial_score = None
-            
-        if tracking_data:
-            log_path = os.path.join(TRACKING_DIR, f"{file_basename}_log.json")
-            with open(log_path, 'w') as f:
-                json.dump({
-                    "filename": file_basename,
-                    "initial_score": initial_score,
-                    "checkpoints": tracking_data
-                }, f, indent=2)
-            
-            plot_progress(tracking_data, file_basename, initial_score if initial_score else 0)
-        else:
-            print("      ⚠️ Failed to extract tracking data. Check if Julia/Gurobi ran correctly.")
-        
-        print("-" * 60)
+    if not FORCE_RERUN:
+        prefix = TRACKING_DIR + os.sep
+        pending = [p for p in input_files if not has_tracking_log(p, prefix)]
+        if len(pending) < len(input_files):
+            print(f"⏭️ Skipping {len(input_files) - len(pending)} inputs with existing tracking logs (set FORCE_RERUN=1 to re-run)")
+        input_files = pending
+
+    total = len(input_files)
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_SOLVERS) as executor:
+        jobs = [executor.submit(_run_one, i, total, input_path, env)
+                for i, input_path in enumerate(input_files)]
+        for job in jobs:
+            job.result()
 
 if __name__ == "__main__":
     run_batch()
\ No newline at end of file
@@ -1,10 +1,18 @@
 import os
 import json
 import glob
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from scipy import interpolate
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib json parser
+    orjson = None
 
 # ================= CONFIGURATION =================
 CURRENT_DIR = os.getcwd()
@@ -17,19 +25,65 @@ FILE_START = 51
 FILE_END = 100
 
 
-def load_tracking_logs(tracking_dir, file_start, file_end):
-    all_data = []
-    for i in range(file_start, file_end + 1):
-        filename = f"schedule_input_{i:03d}_log.json"
-        filepath = os.path.join(tracking_dir, filename)
+CHECKPOINT_FIELDS = ('time', 'objective', 'pct_reduced')
+
+
+def _load_jsonl(filepath):
+    # JSON Lines log: a header row, then one row per checkpoint
+    df = pd.read_json(filepath, lines=True, convert_dates=False, precise_float=True)
+    header = df.iloc[0]
+    checkpoints = df.iloc[1:].reindex(columns=list(CHECKPOINT_FIELDS))
+    initial_score = header.get('initial_score')
+    data = {
+        'filename': header['filename'],
+        'initial_score': None if pd.isna(initial_score) else float(initial_score),
+    }
+    for key in CHECKPOINT_FIELDS:
+        data[key] = checkpoints[key].to_numpy(dtype=np.float64)
+    return data
+
+
+def _load_json(filepath):
+    # Legacy log: a single JSON object with a list of checkpoint dicts
+    if orjson is not None:
+        with open(filepath, 'rb') as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(filepath, 'r') as f:
+            data = json.load(f)
+    # Convert the checkpoint records to column arrays once, here, so the
+    # interpolation, plotting and summary code work on contiguous floats
+    checkpoints = data.pop('checkpoints')
+    for key in CHECKPOINT_FIELDS:
+        data[key] = np.fromiter((cp[key] for cp in checkpoints),
+                                dtype=np.float64, count=len(checkpoints))
+    return data
+
+
+def _load_one(prefix, i):
+    # prefix is tracking_dir + os.sep, precomputed by load_tracking_logs
+    for ext, loader in (('jsonl', _load_jsonl), ('json', _load_json)):
+        filename = f"schedule_input_{i:03d}_log.{ext}"
+        filepath = f"{prefix}{filename}"
         if os.path.exists(filepath):
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-                data['file_id'] = i
+            data = loader(filepath)
+            data['file_id'] = i
+            return filename, data
+    return f"schedule_input_{i:03d}_log.jsonl", None
+
+
+def load_tracking_logs(tracking_dir, file_start, file_end, max_workers=8):
+    all_data = []
+    file_ids = range(file_start, file_end + 1)
+    prefix = tracking_dir + os.sep
+    # Reads and JSON decoding overlap across threads; map() keeps file order
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for filename, data in executor.map(partial(_load_one, prefix), file_ids):
+            if data is not None:
                 all_data.append(data)
                 print(f"  ✓ Loaded: {filename}")
-        else:
-            print(f"  ⚠ Missing: {filename}")
+            else:
+                print(f"  ⚠ Missing: {filename}")
     return all_data
 
 
@@ -39,8 +93,8 @@ def interpolate_to_common_times(all_data, num_points=100):
     
     max_times = []
     for data in all_data:
-        if data['checkpoints']:
-            max_times.append(max(cp['time'] for cp in data['checkpoints']))
+        if len(data['time']):
+            max_times.append(data['time'].max())
     
     if not max_times:
         return None, None, []
@@ -48,20 +102,17 @@ def interpolate_to_common_times(all_data, num_points=100):
     target_max_time = np.median(max_times)
     common_times = np.linspace(0, target_max_time, num_points)
     
-    interpolated_values = []
+    run_times = []
+    run_values = []
     valid_runs = []
     
     for data in all_data:
-        checkpoints = data['checkpoints']
-        if len(checkpoints) < 2:
+        if len(data['time']) < 2:
             continue
         
-        times = np.array([cp['time'] for cp in checkpoints])
-        pct_reduced = np.array([cp['pct_reduced'] for cp in checkpoints])
-        
-        sort_idx = np.argsort(times)
-        times = times[sort_idx]
-        pct_reduced = pct_reduced[sort_idx]
+        sort_idx = np.argsort(data['time'])
+        times = data['time'][sort_idx]
+        pct_reduced = data['pct_reduced'][sort_idx]
         
         unique_times, unique_idx = np.unique(times, return_index=True)
         times = unique_times
@@ -70,52 +121,73 @@ def interpolate_to_common_times(all_data, num_points=100):
         if len(times) < 2:
             continue
         
-        try:
-            f = interpolate.interp1d(
-                times, pct_reduced,
-                kind='linear',
-                bounds_error=False,
-                fill_value=(pct_reduced[0], pct_reduced[-1])
-            )
-            interp_values = f(common_times)
-            interpolated_values.append(interp_values)
-            valid_runs.append(data['file_id'])
-        except Exception as e:
-            print(f"  ⚠ Error interpolating file {data['file_id']}: {e}")
-    
-    if not interpolated_values:
+        run_times.append(times)
+        run_values.append(pct_reduced)
+        valid_runs.append(data['file_id'])
+    
+    if not run_times:
         return None, None, []
     
-    return common_times, np.array(interpolated_values), valid_runs
+    # Shift every run onto its own disjoint time window so a single
+    # np.searchsorted over the concatenated runs finds the bracketing
+    # checkpoints for all runs at once. Indices are clipped to each run's own
+    # segment and the lerp is done in unshifted times, so ends clamp to the
+    # first/last value and no precision is lost to the offsets.
+    lengths = np.array([len(t) for t in run_times])
+    ends = np.cumsum(lengths)[:, None]
+    starts = ends - lengths[:, None]
+    
+    span = max(max(t[-1] for t in run_times), target_max_time) + 1
+    offsets = np.arange(len(run_times))[:, None] * span
+    xp = np.concatenate(run_times)
+    fp = np.concatenate(run_values)
+    xp_shifted = xp + np.repeat(offsets.ravel(), lengths)
+    
+    idx = np.searchsorted(xp_shifted, common_times + offsets, side='right')
+    idx = np.clip(idx, starts + 1, ends - 1)
+    
+    x0, x1 = xp[idx - 1], xp[idx]
+    y0, y1 = fp[idx - 1], fp[idx]
+    weight = np.clip((common_times - x0) / (x1 - x0), 0.0, 1.0)
+    interpolated_values = y0 + (y1 - y0) * weight
+    
+    return common_times, interpolated_values, valid_runs
 
 
 def compute_statistics(interpolated_values):
     mean = np.mean(interpolated_values, axis=0)
-    std = np.std(interpolated_values, axis=0)
     n = interpolated_values.shape[0]
+    # Column sums of squares via einsum, without a squared temporary
+    d = interpolated_values - mean
+    std = np.sqrt(np.einsum('ij,ij->j', d, d) / n)
     ci = 1.96 * std / np.sqrt(n)
+    # One partition pass for all three quantiles instead of three separate calls
+    q25, median, q75 = np.quantile(interpolated_values, [0.25, 0.5, 0.75], axis=0)
     
     return {
         'mean': mean,
         'std': std,
         'ci_lower': mean - ci,
         'ci_upper': mean + ci,
-        'median': np.median(interpolated_values, axis=0),
-        'q25': np.percentile(interpolated_values, 25, axis=0),
-        'q75': np.percentile(interpolated_values, 75, axis=0),
+        'median': median,
+        'q25': q25,
+        'q75': q75,
     }
 
 
 def plot_combined(common_times, stats, num_runs, plots_dir):
     os.makedirs(plots_dir, exist_ok=True)
     
-    fig, ax = plt.subplots(figsize=(14, 8))
+    fig = Figure(figsize=(14, 8), dpi=150)
+    ax = fig.add_subplot(1, 1, 1)
     
     ax.fill_between(common_times, stats['q25'], stats['q75'],
-                    alpha=0.25, color='#9b59b6', label='IQR (25th-75th)')
+                    alpha=0.25, color='#9b59b6', label='IQR (25th-75th)',
+                    rasterized=True)
     
     ax.fill_between(common_times, stats['ci_lower'], stats['ci_upper'], 
-                    alpha=0.4, color='#3498db', label='95% CI')
+                    alpha=0.4, color='#3498db', label='95% CI',
+                    rasterized=True)
     
     ax.plot(common_times, stats['median'], linewidth=2, color='#27ae60',
             linestyle='--', label='Median')
@@ -138,23 +210,24 @@ def plot_combined(common_times, stats, num_runs, plots_dir):
                 xytext=(-120, 20), textcoords='offset points', fontsize=11,
                 arrowprops=dict(arrowstyle='->', color='gray'))
     
-    plt.tight_layout()
+    fig.tight_layout()
     plot_path = os.path.join(plots_dir, 'aggregate_combined.png')
-    plt.savefig(plot_path, dpi=150)
-    plt.close()
+    FigureCanvasAgg(fig).print_png(plot_path)
     print(f"📊 Saved: {plot_path}")
 
 
 def plot_all_runs(all_data, common_times, stats, plots_dir):
-    fig, ax = plt.subplots(figsize=(14, 8))
-    
-    for data in all_data:
-        checkpoints = data['checkpoints']
-        if len(checkpoints) < 2:
-            continue
-        times = [cp['time'] for cp in checkpoints]
-        pct_reduced = [cp['pct_reduced'] for cp in checkpoints]
-        ax.plot(times, pct_reduced, alpha=0.3, linewidth=1, color='#3498db')
+    fig = Figure(figsize=(14, 8), dpi=150)
+    ax = fig.add_subplot(1, 1, 1)
+    
+    # Draw every run in one LineCollection; each segment is alpha-blended
+    # separately, so overlapping runs still darken each other
+    segments = [np.column_stack((data['time'], data['pct_reduced']))
+                for data in all_data if len(data['time']) >= 2]
+    if segments:
+        ax.add_collection(LineCollection(segments, colors='#3498db', alpha=0.3,
+                                         linewidths=1, rasterized=True))
+        ax.autoscale_view()
     
     ax.plot(common_times, stats['mean'], linewidth=3, color='#e74c3c',
             label=f'Mean (n={len(all_data)})')
@@ -166,32 +239,46 @@ def plot_all_runs(all_data, common_times, stats, plots_dir):
     ax.legend(loc='lower right', fontsize=10)
     ax.set_ylim(bottom=0)
     
-    plt.tight_layout()
+    fig.tight_layout()
     plot_path = os.path.join(plots_dir, 'all_runs_overlay.png')
-    plt.savefig(plot_path, dpi=150)
-    plt.close()
+    FigureCanvasAgg(fig).print_png(plot_path)
     print(f"📊 Saved: {plot_path}")
 
 
 def generate_summary_table(all_data, plots_dir):
-    rows = []
-    for data in all_data:
-        checkpoints = data['checkpoints']
-        if not checkpoints:
+    n = len(all_data)
+    file_ids = np.empty(n, dtype=np.int32)
+    filenames = np.empty(n, dtype=object)
+    initial = np.empty(n)
+    final_objective = np.empty(n)
+    final_pct_reduced = np.empty(n)
+    # Checkpoint times are whole seconds; keep them integral in the CSV
+    final_time = np.empty(n, dtype=np.int64)
+    num_checkpoints = np.empty(n, dtype=np.int32)
+    
+    for j, data in enumerate(all_data):
+        num_checkpoints[j] = len(data['time'])
+        file_ids[j] = data['file_id']
+        filenames[j] = data['filename']
+        if not num_checkpoints[j]:
             continue
-        initial_score = data.get('initial_score', checkpoints[0]['objective'])
-        final_checkpoint = checkpoints[-1]
-        rows.append({
-            'file_id': data['file_id'],
-            'filename': data['filename'],
-            'initial_score': initial_score,
-            'final_objective': final_checkpoint['objective'],
-            'final_pct_reduced': final_checkpoint['pct_reduced'],
-            'final_time': final_checkpoint['time'],
-            'num_checkpoints': len(checkpoints)
-        })
-    
-    df = pd.DataFrame(rows)
+        initial_score = data.get('initial_score', data['objective'][0])
+        initial[j] = np.nan if initial_score is None else initial_score
+        final_objective[j] = data['objective'][-1]
+        final_pct_reduced[j] = data['pct_reduced'][-1]
+        final_time[j] = data['time'][-1]
+    
+    # Runs without checkpoints are dropped
+    has_checkpoints = num_checkpoints > 0
+    df = pd.DataFrame({
+        'file_id': file_ids[has_checkpoints],
+        'filename': filenames[has_checkpoints],
+        'initial_score': initial[has_checkpoints],
+        'final_objective': final_objective[has_checkpoints],
+        'final_pct_reduced': final_pct_reduced[has_checkpoints],
+        'final_time': final_time[has_checkpoints],
+        'num_checkpoints': num_checkpoints[has_checkpoints]
+    })
     csv_path = os.path.join(plots_dir, 'run_summary.csv')
     df.to_csv(csv_path, index=False)
     print(f"📄 Saved: {csv_path}")
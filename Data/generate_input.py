@@ -10,11 +10,25 @@ Usage:
 
 import json
 import argparse
-import random
 import numpy as np
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib json encoder
+    orjson = None
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Stdlib json hook for NumPy arrays and scalars, mirroring what orjson's
+    OPT_SERIALIZE_NUMPY handles natively
+    """
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
 
 class LargeScaleInputGenerator:
     """
@@ -35,6 +49,37 @@ class LargeScaleInputGenerator:
         "Mechanical Engineering", "Physics", "Chemistry", "Biology"
     ]
     
+    # Teaching days, in term_config order
+    DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri"]
+    
+    # Instructor availability windows (period indices within a day)
+    PERIODS_MORNING = np.arange(0, 12, dtype=np.int8)    # 8am-2pm
+    PERIODS_AFTERNOON = np.arange(6, 20, dtype=np.int8)  # 11am-6pm
+    PERIODS_EXTENDED = np.arange(0, 18, dtype=np.int8)   # 8am-5pm
+    PERIODS_FULL = np.arange(0, 20, dtype=np.int8)       # 8am-6pm
+    
+    # Name pools for generated instructors and students
+    INSTRUCTOR_FIRST_NAMES = (
+        "Alice", "Bob", "Carol", "David", "Emma", "Frank", "Grace", "Henry",
+        "Iris", "Jack", "Karen", "Leo", "Maria", "Nathan", "Olivia", "Peter",
+        "Quinn", "Rachel", "Sam", "Tina", "Uma", "Victor", "Wendy", "Xavier",
+        "Yuki", "Zoe", "Alex", "Blake", "Casey", "Drew", "Eli", "Fiona"
+    )
+    INSTRUCTOR_LAST_NAMES = (
+        "Anderson", "Brown", "Chen", "Davis", "Evans", "Fischer", "Garcia",
+        "Harris", "Ivanov", "Johnson", "Kim", "Lee", "Martinez", "Nguyen",
+        "O'Brien", "Patel", "Quinn", "Rodriguez", "Smith", "Taylor", "Ueda",
+        "Vargas", "Wang", "Xu", "Yamamoto", "Zhang"
+    )
+    STUDENT_NAMES = (
+        "Emma", "Liam", "Olivia", "Noah", "Ava", "Ethan", "Sophia", "Mason",
+        "Isabella", "William", "Mia", "James", "Charlotte", "Benjamin", "Amelia",
+        "Lucas", "Harper", "Henry", "Evelyn", "Alexander", "Abigail", "Michael",
+        "Emily", "Daniel", "Elizabeth", "Matthew", "Sofia", "Jackson", "Avery",
+        "Sebastian", "Ella", "Jack", "Scarlett", "Aiden", "Grace", "Owen", "Chloe",
+        "Samuel", "Victoria", "David", "Riley", "Joseph", "Aria", "Carter", "Lily"
+    )
+    
     # Course levels and typical enrollments
     COURSE_LEVELS = {
         "100": {"min_enroll": 80, "max_enroll": 200, "prob": 0.15},   # Intro courses
@@ -52,12 +97,77 @@ class LargeScaleInputGenerator:
         "graduate": 0.05
     }
     
+    # Probability of picking each course level, by student year
+    STUDENT_LEVEL_PROBS = {
+        "freshman": {"100": 0.7, "200": 0.3, "300": 0.0, "400": 0.0},
+        "sophomore": {"100": 0.3, "200": 0.5, "300": 0.2, "400": 0.0},
+        "junior": {"100": 0.1, "200": 0.3, "300": 0.5, "400": 0.1},
+        "senior": {"100": 0.0, "200": 0.2, "300": 0.5, "400": 0.3},
+        "graduate": {"100": 0.0, "200": 0.0, "300": 0.3, "400": 0.7}
+    }
+    
+    # Upper bound on courses per student (3-5, graduate students 2-4)
+    MAX_COURSES_PER_STUDENT = 5
+    
+    # Feasibility warning messages, keyed by the issue kind in _check_feasibility
+    FEASIBILITY_MESSAGES = {
+        "room_capacity": "❌ Course {} has {} students but max room capacity is {}",
+        "inst_availability": "❌ {} teaches {}h but only has {}h available (need ~{}h for flexibility)",
+        "total_availability": (
+            "⚠️  Total teaching load ({}h) may be tight given total availability ({}h). "
+            "Recommend ratio of 3:1 or higher."
+        ),
+        "utilization": "⚠️  High time slot utilization ({:.1f}%). Recommend keeping below 50% for flexibility.",
+    }
+    MAX_PRINTED_ISSUES = 20
+    
     def __init__(self, seed: int = 42):
         """
         Initialize generator with random seed for reproducibility
         """
-        random.seed(seed)
-        np.random.seed(seed)
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self._ensure_cached()
+    
+    @classmethod
+    def _ensure_cached(cls):
+        """
+        Build key tuples and normalized probability arrays for the class
+        distributions once per class, shared by every generator instance
+        """
+        if cls.__dict__.get("_cached"):
+            return
+        
+        cls._type_keys = tuple(cls.COURSE_TYPES)
+        cls._type_probs = cls._normalize(list(cls.COURSE_TYPES.values()))
+        cls._level_keys = tuple(cls.COURSE_LEVELS)
+        cls._level_probs = cls._normalize([v["prob"] for v in cls.COURSE_LEVELS.values()])
+        cls._level_min_enroll = np.array([v["min_enroll"] for v in cls.COURSE_LEVELS.values()])
+        cls._level_max_enroll = np.array([v["max_enroll"] for v in cls.COURSE_LEVELS.values()])
+        cls._year_keys = tuple(cls.STUDENT_YEARS)
+        cls._year_probs = cls._normalize(list(cls.STUDENT_YEARS.values()))
+        cls._level_probs_by_year = {
+            year: cls._normalize([probs[level] for level in cls._level_keys])
+            for year, probs in cls.STUDENT_LEVEL_PROBS.items()
+        }
+        cls._cached = True
+    
+    @staticmethod
+    def _enrollment_array(courses: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Collect the courses' expected enrollments into an int32 array
+        """
+        return np.fromiter(
+            (c["expected_enrollment"] for c in courses), np.int32, count=len(courses)
+        )
+    
+    @staticmethod
+    def _normalize(weights: List[float]) -> np.ndarray:
+        """
+        Turn a list of weights into a probability array
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        return weights / weights.sum()
     
     def generate_courses(
         self,
@@ -70,43 +180,45 @@ class LargeScaleInputGenerator:
         courses = []
         course_names = self._generate_course_names(num_courses)
         
+        # Draw every course's level, enrollment, type, lab coin flip and
+        # department up front in NumPy batches
+        level_keys = self._level_keys
+        level_ids = self.rng.choice(len(level_keys), size=num_courses, p=self._level_probs)
+        
+        # Determine expected enrollment based on level
+        enrollments = self.rng.integers(
+            self._level_min_enroll[level_ids], self._level_max_enroll[level_ids] + 1
+        )
+        
+        type_keys = self._type_keys
+        type_ids = self.rng.choice(len(type_keys), size=num_courses, p=self._type_probs)
+        
+        # 70% lecture only (1.5h), 30% with lab (3.0h); only used for upper levels
+        lecture_only = self.rng.random(num_courses) < 0.7
+        department_ids = self.rng.integers(len(self.DEPARTMENTS), size=num_courses)
+        
         for i in range(num_courses):
-            # Determine course level
-            level = random.choices(
-                list(self.COURSE_LEVELS.keys()),
-                weights=[v["prob"] for v in self.COURSE_LEVELS.values()]
-            )[0]
-            
-            # Determine expected enrollment based on level
-            level_info = self.COURSE_LEVELS[level]
-            enrollment = random.randint(level_info["min_enroll"], level_info["max_enroll"])
-            
-            # Determine course type
-            course_type = random.choices(
-                list(self.COURSE_TYPES.keys()),
-                weights=list(self.COURSE_TYPES.values())
-            )[0]
+            level = level_keys[level_ids[i]]
             
             # Assign instructor (roughly equal distribution)
             instructor_idx = i % num_instructors
             
             # Determine weekly hours (most courses are 1.5 hours/week for lecture)
             # Some upper-level courses might have labs (3.0 hours)
-            if level in ["100", "200"]:
+            if level in ["100", "200"] or lecture_only[i]:
                 weekly_hours = 1.5
             else:
-                # 70% lecture only (1.5h), 30% with lab (3.0h)
-                weekly_hours = 1.5 if random.random() < 0.7 else 3.0
+                weekly_hours = 3.0
             
             courses.append({
                 "id": f"COURSE{i:03d}",
                 "name": course_names[i],
-                "type": course_type,
+                "type": type_keys[type_ids[i]],
                 "weekly_hours": weekly_hours,
                 "instructor_id": f"PROF{instructor_idx:03d}",
-                "expected_enrollment": enrollment,
+                "expected_enrollment": int(enrollments[i]),
                 "level": level,
-                "department": random.choice(self.DEPARTMENTS)
+                "department": self.DEPARTMENTS[department_ids[i]]
             })
         
         return courses
@@ -123,15 +235,15 @@ class LargeScaleInputGenerator:
         
         names = []
         for i in range(num_courses):
-            prefix = random.choice(prefixes)
-            number = random.randint(100, 499)
+            prefix = prefixes[self.rng.integers(len(prefixes))]
+            number = self.rng.integers(100, 500)
             # Add descriptive suffix occasionally
             suffixes = [
                 "Introduction", "Advanced", "Theory", "Applications",
                 "Seminar", "Lab", "Workshop", "Project"
             ]
-            if random.random() < 0.3:
-                name = f"{prefix} {number}: {random.choice(suffixes)}"
+            if self.rng.random() < 0.3:
+                name = f"{prefix} {number}: {suffixes[self.rng.integers(len(suffixes))]}"
             else:
                 name = f"{prefix} {number}"
             names.append(name)
@@ -150,36 +262,45 @@ class LargeScaleInputGenerator:
         """
         instructors = []
         
-        # First/last names for variety
-        first_names = [
-            "Alice", "Bob", "Carol", "David", "Emma", "Frank", "Grace", "Henry",
-            "Iris", "Jack", "Karen", "Leo", "Maria", "Nathan", "Olivia", "Peter",
-            "Quinn", "Rachel", "Sam", "Tina", "Uma", "Victor", "Wendy", "Xavier",
-            "Yuki", "Zoe", "Alex", "Blake", "Casey", "Drew", "Eli", "Fiona"
-        ]
-        last_names = [
-            "Anderson", "Brown", "Chen", "Davis", "Evans", "Fischer", "Garcia",
-            "Harris", "Ivanov", "Johnson", "Kim", "Lee", "Martinez", "Nguyen",
-            "O'Brien", "Patel", "Quinn", "Rodriguez", "Smith", "Taylor", "Ueda",
-            "Vargas", "Wang", "Xu", "Yamamoto", "Zhang"
-        ]
-        
         # Calculate how many hours each instructor needs to teach
-        courses_per_instructor = {}
-        total_hours_per_instructor = {}
-        for course in courses:
-            inst_id = course["instructor_id"]
-            courses_per_instructor[inst_id] = courses_per_instructor.get(inst_id, 0) + 1
-            total_hours_per_instructor[inst_id] = total_hours_per_instructor.get(inst_id, 0) + course["weekly_hours"]
+        # Instructor ids are "PROF" + zero-padded index, so accumulate by index
+        course_inst_idx = np.array([int(c["instructor_id"][4:]) for c in courses], dtype=np.intp)
+        course_hours = np.array([c["weekly_hours"] for c in courses], dtype=np.float64)
+        courses_per_instructor = np.bincount(course_inst_idx, minlength=num_instructors)
+        total_hours_per_instructor = np.bincount(
+            course_inst_idx, weights=course_hours, minlength=num_instructors
+        ).tolist()
+        
+        # Draw every instructor's first/last name index in one batch each
+        first_names = self.INSTRUCTOR_FIRST_NAMES
+        last_names = self.INSTRUCTOR_LAST_NAMES
+        first_idx = self.rng.integers(len(first_names), size=num_instructors).tolist()
+        last_idx = self.rng.integers(len(last_names), size=num_instructors).tolist()
+        
+        # Pick an availability window for every (instructor, day slot) up front.
+        # For feasibility, use longer availability windows; most professors
+        # are available the full day. Morning (8am-2pm) and afternoon
+        # (11am-6pm) people only keep their short window if they have few
+        # courses, otherwise they get the extended 8am-5pm window.
+        window_draws = self.rng.random((num_instructors, len(self.DAYS), 2))
+        window_ids = np.where(
+            window_draws[..., 0] < 0.2, 0, np.where(window_draws[..., 1] < 0.2, 1, 2)
+        )
+        window_ids = np.where((window_ids < 2) & (courses_per_instructor[:, None] > 2), 3, window_ids)
+        window_ids = window_ids.tolist()
+        window_templates = (
+            self.PERIODS_MORNING, self.PERIODS_AFTERNOON, self.PERIODS_FULL, self.PERIODS_EXTENDED
+        )
+        courses_per_instructor = courses_per_instructor.tolist()
         
         for i in range(num_instructors):
-            first = random.choice(first_names)
-            last = random.choice(last_names)
+            first = first_names[first_idx[i]]
+            last = last_names[last_idx[i]]
             inst_id = f"PROF{i:03d}"
             
             # Calculate required availability
-            num_courses_to_teach = courses_per_instructor.get(inst_id, 0)
-            hours_to_teach = total_hours_per_instructor.get(inst_id, 0)
+            num_courses_to_teach = courses_per_instructor[i]
+            hours_to_teach = total_hours_per_instructor[i]
             
             # Convert hours to periods (30min each = 2 periods per hour)
             required_periods = int(hours_to_teach * 2)
@@ -190,77 +311,89 @@ class LargeScaleInputGenerator:
             
             # Generate availability with sufficient capacity
             # Start with 4-5 days per week for more flexibility
-            num_days_available = random.choice([4, 5])
-            available_days = random.sample(["Mon", "Tue", "Wed", "Thu", "Fri"], num_days_available)
+            num_days_available = int(self.rng.integers(4, 6))
+            available_days = self.rng.choice(len(self.DAYS), size=num_days_available, replace=False).tolist()
             
-            availability = []
-            for day in available_days:
-                # For feasibility, use longer availability windows
-                # Most professors available 8am-5pm (periods 0-18)
-                if random.random() < 0.2:
-                    # Morning person (8am-2pm) - only if they have few courses
-                    if num_courses_to_teach <= 2:
-                        period_range = range(0, 12)
-                    else:
-                        period_range = range(0, 18)
-                elif random.random() < 0.2:
-                    # Afternoon person (11am-6pm) - only if they have few courses
-                    if num_courses_to_teach <= 2:
-                        period_range = range(6, 20)
-                    else:
-                        period_range = range(0, 18)
-                else:
-                    # Full day (8am-6pm) - most common
-                    period_range = range(0, 20)
-                
-                for period in period_range:
-                    availability.append({"day": day, "period_index": period})
+            # Availability is kept as two parallel arrays (day index, period)
+            # and only turned into dicts by _materialize_availability
+            period_parts = [window_templates[w] for w in window_ids[i][:len(available_days)]]
             
             # Verify we have enough availability
-            total_available_periods = len(availability)
+            total_available_periods = sum(len(periods) for periods in period_parts)
             if total_available_periods < min_periods_needed:
                 # Add more days if needed
-                remaining_days = [d for d in ["Mon", "Tue", "Wed", "Thu", "Fri"] if d not in available_days]
+                remaining_days = [d for d in range(len(self.DAYS)) if d not in available_days]
                 while total_available_periods < min_periods_needed and remaining_days:
                     extra_day = remaining_days.pop(0)
-                    for period in range(0, 20):  # Full day availability
-                        availability.append({"day": extra_day, "period_index": period})
-                    total_available_periods += 20
+                    available_days.append(extra_day)
+                    period_parts.append(self.PERIODS_FULL)  # Full day availability
+                    total_available_periods += len(self.PERIODS_FULL)
+            
+            availability_days = np.concatenate([
+                np.full(len(periods), day, dtype=np.int8)
+                for day, periods in zip(available_days, period_parts)
+            ])
+            availability_periods = np.concatenate(period_parts)
             
             # Back-to-back preference (-1 = prefer, 0 = neutral, 1 = avoid)
             # Most professors slightly prefer or are neutral
-            b2b_pref = random.choices([-1, 0, 1], weights=[0.3, 0.5, 0.2])[0]
+            b2b_pref = int(self.rng.choice([-1, 0, 1], p=[0.3, 0.5, 0.2]))
             
             # Lunch teaching (most avoid, some don't mind)
-            allow_lunch = random.random() < 0.3
+            allow_lunch = bool(self.rng.random() < 0.3)
             
             instructors.append({
                 "id": inst_id,
                 "name": f"Prof. {first} {last}",
-                "availability": availability,
+                "availability": None,  # Filled in by _materialize_availability
+                "_availability": (availability_days, availability_periods),
                 "back_to_back_preference": b2b_pref,
                 "allow_lunch_teaching": allow_lunch,
-                "department": random.choice(self.DEPARTMENTS),
+                "department": self.DEPARTMENTS[self.rng.integers(len(self.DEPARTMENTS))],
                 "_debug": {
                     "courses_to_teach": num_courses_to_teach,
                     "hours_to_teach": hours_to_teach,
-                    "available_periods": len(availability),
+                    "available_periods": total_available_periods,
                     "required_min_periods": min_periods_needed
                 }
             })
         
         return instructors
     
+    @staticmethod
+    def _availability_length(instructor: Dict[str, Any]) -> int:
+        """
+        Number of available periods, whether the availability is still
+        array-based or already materialized as dicts
+        """
+        if "_availability" in instructor:
+            return len(instructor["_availability"][1])
+        return len(instructor["availability"])
+    
+    def _materialize_availability(self, instructor: Dict[str, Any]):
+        """
+        Replace an instructor's array-based availability with the
+        list of {"day", "period_index"} dicts used by the input schema
+        """
+        days, periods = instructor.pop("_availability")
+        instructor["availability"] = [
+            {"day": self.DAYS[d], "period_index": p}
+            for d, p in zip(days.tolist(), periods.tolist())
+        ]
+    
     def generate_classrooms(
         self,
         num_rooms: int,
-        courses: List[Dict[str, Any]]
+        courses: List[Dict[str, Any]],
+        enroll_arr: np.ndarray = None
     ) -> List[Dict[str, Any]]:
         """
         Generate classroom inventory with realistic capacities
         Ensures sufficient capacity for all courses
         """
         classrooms = []
+        if enroll_arr is None:
+            enroll_arr = self._enrollment_array(courses)
         
         # Building names
         buildings = [
@@ -269,7 +402,7 @@ class LargeScaleInputGenerator:
         ]
         
         # Find max enrollment to ensure at least one room can fit it
-        max_enrollment = max(c["expected_enrollment"] for c in courses)
+        max_enrollment = int(enroll_arr.max())
         
         # Capacity distribution (realistic for university)
         # Ensure we have rooms that can fit all courses
@@ -281,23 +414,25 @@ class LargeScaleInputGenerator:
             (120, 250, 0.15), # Auditoriums (increased max to handle large courses)
         ]
         
+        capacity_probs = self._normalize([w for _, _, w in capacity_distribution])
+        
         # Ensure at least one room can fit the largest course
         rooms_added = 0
         for i in range(num_rooms):
-            building = random.choice(buildings)
-            room_num = random.randint(100, 599)
+            building = buildings[self.rng.integers(len(buildings))]
+            room_num = self.rng.integers(100, 600)
             
             # For first few rooms, ensure we have large rooms
             if i < 3:
                 # Guarantee large rooms for big courses
-                capacity = random.randint(max(120, max_enrollment), max(250, max_enrollment + 50))
+                capacity = int(self.rng.integers(max(120, max_enrollment), max(250, max_enrollment + 50) + 1))
             else:
                 # Select capacity range based on distribution
-                cap_min, cap_max, _ = random.choices(
-                    capacity_distribution,
-                    weights=[w for _, _, w in capacity_distribution]
-                )[0]
-                capacity = random.randint(cap_min, cap_max)
+                cap_min, cap_max, _ = capacity_distribution[self.rng.choice(
+                    len(capacity_distribution),
+                    p=capacity_probs
+                )]
+                capacity = int(self.rng.integers(cap_min, cap_max + 1))
             
             classrooms.append({
                 "id": f"ROOM{i:03d}",
@@ -307,19 +442,21 @@ class LargeScaleInputGenerator:
             rooms_added += 1
         
         # Verify capacity coverage
-        course_enrollments = sorted([c["expected_enrollment"] for c in courses], reverse=True)
-        room_capacities = sorted([r["capacity"] for r in classrooms], reverse=True)
+        course_enrollments = np.sort(enroll_arr)[::-1]
+        room_capacities = np.sort(
+            np.fromiter((r["capacity"] for r in classrooms), np.int32, count=len(classrooms))
+        )[::-1]
+        largest_room = int(room_capacities[0])
         
         print(f"\n  Classroom capacity check:")
         print(f"    Largest course: {course_enrollments[0]} students")
-        print(f"    Largest room: {room_capacities[0]} capacity")
-        print(f"    Top 5 course sizes: {course_enrollments[:5]}")
-        print(f"    Top 5 room capacities: {room_capacities[:5]}")
+        print(f"    Largest room: {largest_room} capacity")
+        print(f"    Top 5 course sizes: {course_enrollments[:5].tolist()}")
+        print(f"    Top 5 room capacities: {room_capacities[:5].tolist()}")
         
         # Verify each course can fit in at least one room
-        for enrollment in course_enrollments:
-            if enrollment > room_capacities[0]:
-                print(f"    ⚠️  WARNING: Course with {enrollment} students exceeds largest room ({room_capacities[0]})")
+        for enrollment in course_enrollments[course_enrollments > largest_room].tolist():
+            print(f"    ⚠️  WARNING: Course with {enrollment} students exceeds largest room ({largest_room})")
         
         return classrooms
     
@@ -338,83 +475,108 @@ class LargeScaleInputGenerator:
         """
         students = []
         
-        # Common first names
-        names = [
-            "Emma", "Liam", "Olivia", "Noah", "Ava", "Ethan", "Sophia", "Mason",
-            "Isabella", "William", "Mia", "James", "Charlotte", "Benjamin", "Amelia",
-            "Lucas", "Harper", "Henry", "Evelyn", "Alexander", "Abigail", "Michael",
-            "Emily", "Daniel", "Elizabeth", "Matthew", "Sofia", "Jackson", "Avery",
-            "Sebastian", "Ella", "Jack", "Scarlett", "Aiden", "Grace", "Owen", "Chloe",
-            "Samuel", "Victoria", "David", "Riley", "Joseph", "Aria", "Carter", "Lily"
-        ]
+        level_keys = self._level_keys
+        year_keys = self._year_keys
         
-        # Organize courses by level for easier selection
-        courses_by_level = {
-            "100": [c for c in courses if c["level"] == "100"],
-            "200": [c for c in courses if c["level"] == "200"],
-            "300": [c for c in courses if c["level"] == "300"],
-            "400": [c for c in courses if c["level"] == "400"],
-        }
+        # Course indices per int-coded level, built once for all students
+        course_levels = np.array([level_keys.index(c["level"]) for c in courses], dtype=np.int8)
+        level_idx_arr = [np.flatnonzero(course_levels == l) for l in range(len(level_keys))]
+        
+        # Determine student years in one batch
+        years = self.rng.choice(len(year_keys), size=num_students, p=self._year_probs)
+        
+        # Determine number of courses (3-5 typically, graduate students might take fewer)
+        is_graduate = years == year_keys.index("graduate")
+        num_to_take = np.where(
+            is_graduate,
+            self.rng.integers(2, 5, size=num_students),
+            self.rng.integers(3, 6, size=num_students)
+        )
+        
+        # Pre-draw a level for every (student, slot), one batch per year group
+        max_slots = self.MAX_COURSES_PER_STUDENT
+        slot_levels = np.empty((num_students, max_slots), dtype=np.int8)
+        for y, year in enumerate(year_keys):
+            rows = np.flatnonzero(years == y)
+            slot_levels[rows] = self.rng.choice(
+                len(level_keys), size=(len(rows), max_slots), p=self._level_probs_by_year[year]
+            )
+        
+        # Pre-draw a course for every slot, one batch per level (-1 = level has no courses)
+        picks = np.full((num_students, max_slots), -1, dtype=np.int32)
+        for l, level_idx in enumerate(level_idx_arr):
+            slots = slot_levels == l
+            if len(level_idx):
+                picks[slots] = self.rng.choice(level_idx, size=int(slots.sum()))
+        
+        # Draw all student names in one batch
+        names = self.STUDENT_NAMES
+        name_idx = self.rng.integers(len(names), size=num_students).tolist()
+        full_names = [f"{names[j]} {i}" for i, j in enumerate(name_idx)]
         
         for i in range(num_students):
-            # Determine student year
-            year = random.choices(
-                list(self.STUDENT_YEARS.keys()),
-                weights=list(self.STUDENT_YEARS.values())
-            )[0]
+            k = num_to_take[i]
+            row = picks[i, :k].tolist()
             
-            # Determine number of courses (3-5 typically, graduate students might take fewer)
-            if year == "graduate":
-                num_courses_to_take = random.choice([2, 3, 4])
+            if -1 in row or len(set(row)) < k:
+                # Duplicate or missing picks: redo this student slot by slot
+                enrolled_idx = self._pick_courses_sequential(
+                    courses, row, slot_levels[i, :k], level_idx_arr
+                )
             else:
-                num_courses_to_take = random.choice([3, 4, 5])
+                enrolled_idx = picks[i, :k]
             
-            # Determine which levels to take based on year
-            if year == "freshman":
-                level_probs = {"100": 0.7, "200": 0.3, "300": 0.0, "400": 0.0}
-            elif year == "sophomore":
-                level_probs = {"100": 0.3, "200": 0.5, "300": 0.2, "400": 0.0}
-            elif year == "junior":
-                level_probs = {"100": 0.1, "200": 0.3, "300": 0.5, "400": 0.1}
-            elif year == "senior":
-                level_probs = {"100": 0.0, "200": 0.2, "300": 0.5, "400": 0.3}
-            else:  # graduate
-                level_probs = {"100": 0.0, "200": 0.0, "300": 0.3, "400": 0.7}
-            
-            # Select courses based on level preferences
-            enrolled_courses = []
-            available_courses = courses.copy()
+            students.append({
+                "id": f"STU{i:04d}",
+                "name": full_names[i],
+                "year": year_keys[years[i]],
+                "enrolled_course_ids": None,  # Filled in by _materialize_enrollments
+                "_enrolled_idx": enrolled_idx
+            })
+        
+        return students
+    
+    def _pick_courses_sequential(
+        self,
+        courses: List[Dict[str, Any]],
+        row: List[int],
+        row_levels: np.ndarray,
+        level_idx_arr: List[np.ndarray]
+    ) -> np.ndarray:
+        """
+        Select one student's courses slot by slot, keeping pre-drawn picks
+        that are still available and re-drawing the rest
+        """
+        enrolled_idx = []
+        taken = np.zeros(len(courses), dtype=bool)
+        
+        for j, l in zip(row, row_levels):
+            if taken.all():
+                break
             
-            for _ in range(num_courses_to_take):
-                if not available_courses:
-                    break
-                
-                # Choose a level based on probability
-                level = random.choices(
-                    list(level_probs.keys()),
-                    weights=list(level_probs.values())
-                )[0]
-                
+            if j < 0 or taken[j]:
                 # Get courses at this level that haven't been selected
-                candidates = [c for c in available_courses if c["level"] == level]
+                level_idx = level_idx_arr[l]
+                candidates = level_idx[~taken[level_idx]]
                 
-                if not candidates:
+                if not len(candidates):
                     # Fallback to any available course
-                    candidates = available_courses
+                    candidates = np.flatnonzero(~taken)
                 
-                if candidates:
-                    course = random.choice(candidates)
-                    enrolled_courses.append(course["id"])
-                    available_courses.remove(course)
+                j = candidates[self.rng.integers(len(candidates))]
             
-            students.append({
-                "id": f"STU{i:04d}",
-                "name": f"{random.choice(names)} {i}",
-                "year": year,
-                "enrolled_course_ids": enrolled_courses
-            })
+            taken[j] = True
+            enrolled_idx.append(j)
         
-        return students
+        return np.array(enrolled_idx, dtype=np.int32)
+    
+    def _materialize_enrollments(self, student: Dict[str, Any], course_ids: List[str]):
+        """
+        Replace a student's course index array with the list of course ids
+        used by the input schema
+        """
+        enrolled_idx = student.pop("_enrolled_idx")
+        student["enrolled_course_ids"] = [course_ids[j] for j in enrolled_idx.tolist()]
     
     def generate_complete_input(
         self,
@@ -442,46 +604,53 @@ class LargeScaleInputGenerator:
         # Generate components in order (courses first, then instructors based on courses)
         print("\n  Generating courses...")
         courses = self.generate_courses(num_courses, num_instructors)
+        enroll_arr = self._enrollment_array(courses)
         
         print("  Generating instructors with sufficient availability...")
         instructors = self.generate_instructors(num_instructors, num_courses, courses)
         
         print("  Generating classrooms with sufficient capacity...")
-        classrooms = self.generate_classrooms(num_rooms, courses)
+        classrooms = self.generate_classrooms(num_rooms, courses, enroll_arr)
         
         print("  Generating students...")
         students = self.generate_students(num_students, courses)
         
         # Perform feasibility checks
         print("\n  Performing feasibility checks...")
-        self._check_feasibility(courses, instructors, classrooms, num_weeks)
+        self._check_feasibility(courses, instructors, classrooms, num_weeks, enroll_arr)
         
         # Calculate statistics
-        total_enrollment = sum(len(s["enrolled_course_ids"]) for s in students)
+        enroll_counts = np.fromiter(
+            (len(s["_enrolled_idx"]) for s in students), np.int64, count=len(students)
+        )
+        total_enrollment = int(enroll_counts.sum())
         avg_courses_per_student = total_enrollment / num_students
         
         # Calculate conflict matrix
-        conflict_count = 0
-        for student in students:
-            courses_taken = student["enrolled_course_ids"]
-            # Each pair of courses creates a conflict potential
-            conflict_count += len(courses_taken) * (len(courses_taken) - 1) // 2
+        # Each pair of a student's courses creates a conflict potential
+        conflict_count = int((enroll_counts * (enroll_counts - 1) // 2).sum())
         
         print("\n  Statistics:")
         print(f"    Average courses per student: {avg_courses_per_student:.2f}")
         print(f"    Total enrollments: {total_enrollment}")
         print(f"    Potential conflict pairs: {conflict_count}")
         
-        # Clean up debug info from instructors
+        # Clean up debug info from instructors and build their availability dicts
         for instructor in instructors:
             if "_debug" in instructor:
                 del instructor["_debug"]
+            self._materialize_availability(instructor)
+        
+        # Turn students' course indices into course ids
+        course_ids = [c["id"] for c in courses]
+        for student in students:
+            self._materialize_enrollments(student, course_ids)
         
         # Assemble complete input
         input_data = {
             "term_config": {
                 "num_weeks": num_weeks,
-                "days": ["Mon", "Tue", "Wed", "Thu", "Fri"],
+                "days": list(self.DAYS),
                 "period_length_minutes": 30,
                 "day_start_time": "08:00",
                 "day_end_time": "20:00",
@@ -523,60 +692,51 @@ class LargeScaleInputGenerator:
         courses: List[Dict[str, Any]],
         instructors: List[Dict[str, Any]],
         classrooms: List[Dict[str, Any]],
-        num_weeks: int
+        num_weeks: int,
+        enroll_arr: np.ndarray = None
     ):
         """
         Perform basic feasibility checks to catch obvious infeasibility
         """
         issues = []
+        if enroll_arr is None:
+            enroll_arr = self._enrollment_array(courses)
         
         # Check 1: Room capacity
         max_room_capacity = max(r["capacity"] for r in classrooms)
-        for course in courses:
-            if course["expected_enrollment"] > max_room_capacity:
-                issues.append(
-                    f"❌ Course {course['id']} has {course['expected_enrollment']} students "
-                    f"but max room capacity is {max_room_capacity}"
-                )
+        for k in np.flatnonzero(enroll_arr > max_room_capacity).tolist():
+            issues.append(
+                ("room_capacity", courses[k]["id"], int(enroll_arr[k]), max_room_capacity)
+            )
         
         # Check 2: Instructor availability vs teaching load
-        instructor_dict = {i["id"]: i for i in instructors}
-        courses_by_instructor = {}
-        hours_by_instructor = {}
+        # (instructor ids are "PROF" + their index in the instructors list)
+        hours = np.fromiter((c["weekly_hours"] for c in courses), np.float64, count=len(courses))
+        inst_idx = np.fromiter(
+            (int(c["instructor_id"][4:]) for c in courses), np.int32, count=len(courses)
+        )
+        avail_lens = np.fromiter(
+            (self._availability_length(i) for i in instructors), np.int32, count=len(instructors)
+        )
+        hours_per = np.bincount(inst_idx, weights=hours, minlength=len(instructors))
+        available_hours = avail_lens * 0.5  # Each period is 30 min
         
-        for course in courses:
-            inst_id = course["instructor_id"]
-            if inst_id not in courses_by_instructor:
-                courses_by_instructor[inst_id] = []
-                hours_by_instructor[inst_id] = 0
-            courses_by_instructor[inst_id].append(course)
-            hours_by_instructor[inst_id] += course["weekly_hours"]
-        
-        for inst_id, inst_courses in courses_by_instructor.items():
-            instructor = instructor_dict[inst_id]
-            available_periods = len(instructor["availability"])
-            available_hours = available_periods * 0.5  # Each period is 30 min
-            
-            required_hours = hours_by_instructor[inst_id]
-            # Need at least 3x the hours for scheduling flexibility
-            min_required_availability = required_hours * 3
-            
-            if available_hours < min_required_availability:
-                issues.append(
-                    f"❌ {instructor['name']} teaches {required_hours}h but only has "
-                    f"{available_hours}h available (need ~{min_required_availability}h for flexibility)"
-                )
+        # Need at least 3x the hours for scheduling flexibility
+        min_required_availability = hours_per * 3
+        
+        for k in np.flatnonzero(available_hours < min_required_availability).tolist():
+            issues.append((
+                "inst_availability", instructors[k]["name"], hours_per[k].item(),
+                available_hours[k].item(), min_required_availability[k].item()
+            ))
         
         # Check 3: Total teaching hours vs total available hours
-        total_course_hours = sum(c["weekly_hours"] for c in courses)
-        total_available_hours = sum(len(i["availability"]) * 0.5 for i in instructors)
+        total_course_hours = hours.sum().item()
+        total_available_hours = available_hours.sum().item()
         
         # Need at least 3x availability for scheduling flexibility
         if total_available_hours < total_course_hours * 3:
-            issues.append(
-                f"⚠️  Total teaching load ({total_course_hours}h) may be tight given "
-                f"total availability ({total_available_hours}h). Recommend ratio of 3:1 or higher."
-            )
+            issues.append(("total_availability", total_course_hours, total_available_hours))
         
         # Check 4: Number of time slots vs course sessions needed
         num_days = 5  # Mon-Fri
@@ -601,16 +761,16 @@ class LargeScaleInputGenerator:
         
         print(f"    Time slot utilization: {utilization*100:.1f}%")
         if utilization > 0.5:
-            issues.append(
-                f"⚠️  High time slot utilization ({utilization*100:.1f}%). "
-                f"Recommend keeping below 50% for flexibility."
-            )
+            issues.append(("utilization", utilization * 100))
         
         # Print results
         if issues:
             print(f"\n  ⚠️  Feasibility warnings ({len(issues)}):")
-            for issue in issues:
-                print(f"    {issue}")
+            # Issues are (kind, *values) tuples; only the printed ones get formatted
+            for kind, *values in issues[:self.MAX_PRINTED_ISSUES]:
+                print(f"    {self.FEASIBILITY_MESSAGES[kind].format(*values)}")
+            if len(issues) > self.MAX_PRINTED_ISSUES:
+                print(f"    ... and {len(issues) - self.MAX_PRINTED_ISSUES} more")
             print(f"\n  Note: These are warnings. The optimizer may still find a solution.")
         else:
             print(f"    ✅ All basic feasibility checks passed!")
@@ -618,14 +778,31 @@ class LargeScaleInputGenerator:
             print(f"    ✅ Total availability: {total_available_hours}h")
             print(f"    ✅ Availability ratio: {total_available_hours/total_course_hours:.1f}:1")
     
+    @staticmethod
+    def _encode_json(value: Any) -> bytes:
+        """
+        Encode a value as 2-space indented JSON (orjson when available)
+        """
+        if orjson is not None:
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(value, indent=2, default=_json_default).encode("utf-8")
+    
     def save_to_file(self, input_data: Dict[str, Any], filename: str):
         """
         Save generated input to JSON file
         """
-        with open(filename, 'w') as f:
-            json.dump(input_data, f, indent=2)
-        
-        file_size_mb = len(json.dumps(input_data)) / (1024 * 1024)
+        # Write the top-level sections one at a time, counting bytes as we go
+        bytes_written = 0
+        with open(filename, 'wb') as f:
+            bytes_written += f.write(b"{")
+            for n, (key, value) in enumerate(input_data.items()):
+                # Re-indent the section by one level to nest it under the root
+                chunk = self._encode_json(value).replace(b"\n", b"\n  ")
+                bytes_written += f.write(b",\n  " if n else b"\n  ")
+                bytes_written += f.write(self._encode_json(key) + b": " + chunk)
+            bytes_written += f.write(b"\n}" if input_data else b"}")
+        
+        file_size_mb = bytes_written / (1024 * 1024)
         print(f"\n✅ Saved to {filename}")
         print(f"   File size: {file_size_mb:.2f} MB")
     
@@ -663,7 +840,10 @@ class LargeScaleInputGenerator:
             }
         ]
         
-        for scenario in scenarios:
+        for scenario_idx, scenario in enumerate(scenarios):
+            # Independent, reproducible stream per scenario; class caches are kept
+            self.rng = np.random.default_rng(self.seed + scenario_idx)
+            
             print(f"\n{'='*70}")
             print(f"Generating scenario: {scenario['name']}")
             print(f"{'='*70}")
@@ -19,11 +19,18 @@ end
 
 function main()
     if length(ARGS) < 1
-        println("Usage: julia cli_runner.jl <input_json_file>")
+        println("Usage: julia cli_runner.jl <input_json_file> [--logfile <gurobi_log_file>]")
         exit(1)
     end
 
     input_file = ARGS[1]
+
+    # Optional: also write the Gurobi log to this file
+    log_file = ""
+    idx = findfirst(==("--logfile"), ARGS)
+    if idx !== nothing && idx < length(ARGS)
+        log_file = ARGS[idx + 1]
+    end
     
     if !isfile(input_file)
         println("❌ Error: Input file '$input_file' not found.")
@@ -38,7 +45,7 @@ function main()
 
     # Call the solver function from course_scheduler.jl
     # This will print the "Initial Heuristic Score" and Gurobi logs to stdout
-    result = solve_scheduling_problem(input_data)
+    result = solve_scheduling_problem(input_data; log_file=log_file)
     
     # We don't strictly need to save the result JSON here as Python handles the logs,
     # but it's good practice to verify completion.
@@ -409,7 +409,7 @@ end
 # MODEL BUILDER
 # =================================================================================
 
-function build_and_solve_model(parsed)
+function build_and_solve_model(parsed; log_file::AbstractString="")
     C = length(parsed.course_ids)
     I = length(parsed.inst_ids)
     R = length(parsed.room_ids)
@@ -425,6 +425,10 @@ function build_and_solve_model(parsed)
     set_optimizer_attribute(model, "TimeLimit", 1800.0)
     set_optimizer_attribute(model, "Presolve", 1)
     set_optimizer_attribute(model, "MIPFocus", 1) 
+    if !isempty(log_file)
+        # Also write the Gurobi log to a file so callers can parse it after the solve
+        set_optimizer_attribute(model, "LogFile", log_file)
+    end
     
     println("🗓️ Building Model: $C courses, 2 Half-Terms, $D days, $P periods")
 
@@ -845,12 +849,12 @@ end
 # MAIN ENTRY POINT
 # =================================================================================
 
-function solve_scheduling_problem(input_dict::Dict)
+function solve_scheduling_problem(input_dict::Dict; log_file::AbstractString="")
     try
         println("📊 Julia solver started at $(now())")
         setup_gurobi_license()
         parsed = parse_input(input_dict)
-        model, x, obj_s1, obj_s2, obj_s3, initial_score = build_and_solve_model(parsed)
+        model, x, obj_s1, obj_s2, obj_s3, initial_score = build_and_solve_model(parsed; log_file=log_file)
         output = format_output(model, x, parsed, initial_score, obj_s1, obj_s2, obj_s3)
         println("✅ Julia solver completed: $(output["status"])")
         return output